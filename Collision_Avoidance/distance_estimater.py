@@ -1,5 +1,19 @@
 import cv2
 import mediapipe as mp
+import numpy as np
+import queue
+import threading
+
+CAMERA_INDEX = 0 # 0 for default CSI camera or first USB camera
+CAMERA_FRAME_WIDTH = 640
+CAMERA_FRAME_HEIGHT = 480
+
+PIPELINE_QUEUE_SIZE = 2
+QUEUE_POLL_TIMEOUT = 0.1
+MOTION_THUMBNAIL_SIZE = (64, 48)
+MOTION_THRESHOLD = 2.0 # Mean absolute grey-level change below which a frame counts as static
+MAX_SKIPPED_FRAMES = 3
+INFERENCE_MAX_WIDTH = 480 # MediaPipe resizes to ~256px internally, larger frames only cost bandwidth
 
 def get_hand_bbox_and_width(image: cv2.Mat, hand_landmarks: mp.solutions.hands.HandLandmark) -> tuple:
     """
@@ -14,27 +28,278 @@ def get_hand_bbox_and_width(image: cv2.Mat, hand_landmarks: mp.solutions.hands.H
     """
     
     h, w, _ = image.shape
-    x_coords = []
-    y_coords = []
 
     if not hand_landmarks:
         return 0, None
 
-    for landmark in hand_landmarks.landmark:
-        x_coords.append(landmark.x * w)
-        y_coords.append(landmark.y * h)
-
-    if not x_coords or not y_coords:
+    landmarks = hand_landmarks.landmark
+    num_landmarks = len(landmarks)
+    if num_landmarks == 0:
         return 0, None
 
-    min_x, max_x = min(x_coords), max(x_coords)
-    min_y, max_y = min(y_coords), max(y_coords)
+    # Single pass over the landmarks, tracking both extremes per axis at once.
+    # Landmarks are normalized to [0, 1], so the extremes are found in that
+    # space and only the four results are scaled to pixels afterwards.
+    first = landmarks[0]
+    min_x = max_x = first.x
+    min_y = max_y = first.y
+    for i in range(1, num_landmarks):
+        landmark = landmarks[i]
+        x = landmark.x
+        y = landmark.y
+
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+
+    min_x, max_x = min_x * w, max_x * w
+    min_y, max_y = min_y * h, max_y * h
 
     bbox_pixel_width = max_x - min_x
     bbox_for_drawing = (int(min_x), int(min_y), int(max_x), int(max_y))
 
     return bbox_pixel_width, bbox_for_drawing
 
+def open_camera() -> cv2.VideoCapture:
+    """
+    Opens the camera at a low resolution with MJPG compression and a single-frame driver buffer.
+    Drivers that do not support a property simply keep their default for it.
+    
+    Returns:
+        cv2.VideoCapture: The camera, check isOpened() before use.
+    """
+    
+    cap = cv2.VideoCapture(CAMERA_INDEX)
+    if cap.isOpened():
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_FRAME_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_FRAME_HEIGHT)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    return cap
+
+def put_until_stopped(target_queue: queue.Queue, item: object, stop_event: threading.Event) -> bool:
+    """
+    Puts an item on a bounded queue, giving up once the pipeline is asked to stop.
+    
+    Args:
+        target_queue (queue.Queue): The queue feeding the next pipeline stage.
+        item (object): The item to enqueue.
+        stop_event (threading.Event): Event signalling the pipeline to shut down.
+    
+    Returns:
+        bool: True if the item was enqueued, False if the pipeline was stopped first.
+    """
+    
+    while not stop_event.is_set():
+        try:
+            target_queue.put(item, timeout=QUEUE_POLL_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+class FreshestFrameGrabber:
+    """
+    Reads a camera on a background thread and keeps only the newest frame.
+    Stale frames are dropped, so consumers never block on cap.read() and
+    never process a frame older than the latest one the camera delivered.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, stop_event: threading.Event) -> None:
+        """
+        Args:
+            cap (cv2.VideoCapture): The opened camera.
+            stop_event (threading.Event): Event signalling the pipeline to shut down.
+        """
+        
+        self.cap = cap
+        self.stop_event = stop_event
+        self.condition = threading.Condition()
+        self.latest_frame = None
+        self.frame_id = 0
+        self.running = False
+        self.thread = threading.Thread(target=self.update, daemon=True)
+
+    def start(self) -> "FreshestFrameGrabber":
+        """
+        Starts the reader thread.
+        
+        Returns:
+            FreshestFrameGrabber: The grabber itself, for chaining.
+        """
+        
+        self.running = True
+        self.thread.start()
+        return self
+
+    def update(self) -> None:
+        """
+        Reader loop: overwrites the single frame slot with every frame the camera returns.
+        """
+        
+        try:
+            while not self.stop_event.is_set() and self.cap.isOpened():
+                success, image = self.cap.read()
+                if not success:
+                    print("Ignoring empty camera frame.")
+                    continue
+
+                with self.condition:
+                    self.latest_frame = image
+                    self.frame_id += 1
+                    self.condition.notify_all()
+        finally:
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+
+    def read(self, last_frame_id: int = 0, timeout: float = QUEUE_POLL_TIMEOUT) -> tuple:
+        """
+        Returns the newest frame if it is newer than the one the caller already has.
+        
+        Args:
+            last_frame_id (int): Id of the last frame the caller received.
+            timeout (float): Maximum time in seconds to wait for a newer frame.
+        
+        Returns:
+            tuple: A tuple containing the frame id and the frame, or (last_frame_id, None) if no newer frame arrived.
+        """
+        
+        with self.condition:
+            self.condition.wait_for(lambda: self.frame_id > last_frame_id or not self.running, timeout)
+            if self.frame_id > last_frame_id:
+                return self.frame_id, self.latest_frame
+
+        return last_frame_id, None
+
+def detect_hands(hands: mp.solutions.hands.Hands, image: np.ndarray, rgb_buffer: np.ndarray = None) -> tuple:
+    """
+    Runs MediaPipe Hands on a BGR frame.
+    
+    Args:
+        hands (mp.solutions.hands.Hands): The MediaPipe hands detector.
+        image (np.ndarray): The mirrored BGR camera frame.
+        rgb_buffer (np.ndarray): RGB buffer returned by the previous call, reused when the size still matches.
+    
+    Returns:
+        tuple: A tuple containing the MediaPipe results, with landmarks normalized to the frame size, and the RGB buffer to pass to the next call.
+    """
+    
+    # Landmarks come back normalized to [0, 1], so inference can run on a
+    # downscaled copy while drawing and bbox math use the full frame.
+    frame_height, frame_width = image.shape[:2]
+    if frame_width > INFERENCE_MAX_WIDTH:
+        inference_height = round(frame_height * INFERENCE_MAX_WIDTH / frame_width)
+        inference_image = cv2.resize(image, (INFERENCE_MAX_WIDTH, inference_height), interpolation=cv2.INTER_AREA)
+    else:
+        inference_image = image
+
+    if rgb_buffer is None or rgb_buffer.shape != inference_image.shape:
+        rgb_buffer = np.empty_like(inference_image)
+
+    # Reversing the channel axis into the reused buffer is a single fused pass,
+    # without a per-frame allocation or cv2.cvtColor's binding overhead.
+    rgb_buffer.flags.writeable = True
+    np.copyto(rgb_buffer, inference_image[:, :, ::-1])
+    rgb_buffer.flags.writeable = False
+    
+    # The RGB copy is only read by MediaPipe; landmarks are drawn on the
+    # original BGR frame, so no RGB->BGR conversion back is needed.
+    return hands.process(rgb_buffer), rgb_buffer
+
+def process_frames(hands: mp.solutions.hands.Hands, grabber: FreshestFrameGrabber, result_queue: queue.Queue, stop_event: threading.Event) -> None:
+    """
+    Inference stage: runs MediaPipe Hands on the freshest camera frame and forwards the mirrored frame together with its results.
+    When a frame barely differs from the last one inference ran on, the previous results are reused,
+    but inference is never skipped for more than MAX_SKIPPED_FRAMES frames in a row.
+    A None sentinel is queued once the camera stops delivering frames, or the exception
+    if inference fails, so the display loop never waits on a dead thread.
+    
+    Args:
+        hands (mp.solutions.hands.Hands): The MediaPipe hands detector, used only from this thread.
+        grabber (FreshestFrameGrabber): The running frame grabber.
+        result_queue (queue.Queue): Queue of (image, results) tuples, then a None or exception sentinel, for the display loop.
+        stop_event (threading.Event): Event signalling the pipeline to shut down.
+    """
+    
+    frame_id = 0
+    results = None
+    rgb_buffer = None
+    reference_thumbnail = None
+    skipped_frames = 0
+    pipeline_output = None
+    try:
+        while not stop_event.is_set():
+            frame_id, image = grabber.read(frame_id)
+            if image is None:
+                if not grabber.running:
+                    break
+                continue
+
+            image = cv2.flip(image, 1)
+
+            # Compare against the frame inference last ran on rather than the previous
+            # frame, so slow movement still accumulates into a detectable change.
+            thumbnail = cv2.cvtColor(cv2.resize(image, MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            if (results is not None and skipped_frames < MAX_SKIPPED_FRAMES
+                    and cv2.absdiff(reference_thumbnail, thumbnail).mean() < MOTION_THRESHOLD):
+                skipped_frames += 1
+            else:
+                results, rgb_buffer = detect_hands(hands, image, rgb_buffer)
+                reference_thumbnail = thumbnail
+                skipped_frames = 0
+
+            if not put_until_stopped(result_queue, (image, results), stop_event):
+                return
+    except Exception as error:
+        pipeline_output = error
+    finally:
+        put_until_stopped(result_queue, pipeline_output, stop_event)
+
+def start_hand_pipeline(cap: cv2.VideoCapture, hands: mp.solutions.hands.Hands) -> tuple:
+    """
+    Starts the frame grabber and inference threads so camera reads overlap with MediaPipe inference.
+    
+    Args:
+        cap (cv2.VideoCapture): The opened camera.
+        hands (mp.solutions.hands.Hands): The MediaPipe hands detector.
+    
+    Returns:
+        tuple: A tuple containing the result queue, the stop event and the started threads.
+    """
+    
+    result_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop_event = threading.Event()
+
+    grabber = FreshestFrameGrabber(cap, stop_event).start()
+    inference_thread = threading.Thread(target=process_frames, args=(hands, grabber, result_queue, stop_event), daemon=True)
+    inference_thread.start()
+
+    threads = [grabber.thread, inference_thread]
+
+    return result_queue, stop_event, threads
+
+def stop_hand_pipeline(stop_event: threading.Event, threads: list) -> None:
+    """
+    Signals the pipeline threads to stop and waits for them, so the camera and detector can be released safely.
+    
+    Args:
+        stop_event (threading.Event): Event signalling the pipeline to shut down.
+        threads (list): The threads returned by start_hand_pipeline.
+    """
+    
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+
 def calibrate_camera() -> tuple:
     """
     Calibrates the camera to find the focal length based on a known hand width and distance.
@@ -74,7 +339,7 @@ def calibrate_camera() -> tuple:
     print(f"5. When you are ready and your hand is positioned correctly, press the 'c' key to capture.")
     print(f"6. Press 'q' to quit calibration.")
 
-    cap = cv2.VideoCapture(0) # 0 for default CSI camera or first USB camera
+    cap = open_camera()
     if not cap.isOpened():
         print("Error: Cannot open camera.")
         return None
@@ -82,6 +347,7 @@ def calibrate_camera() -> tuple:
     mp_hands = mp.solutions.hands
     hands = mp_hands.Hands(static_image_mode=False,
                            max_num_hands=1,
+                           model_complexity=0,
                            min_detection_confidence=0.7,
                            min_tracking_confidence=0.7)
     mp_drawing = mp.solutions.drawing_utils
@@ -89,43 +355,37 @@ def calibrate_camera() -> tuple:
     focal_length_calculated = None
     captured_pixel_width = 0
 
-    while cap.isOpened():
-        success, image = cap.read()
-        if not success:
-            print("Ignoring empty camera frame.")
-            continue
-        
-        image = cv2.flip(image, 1)
-        
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image_rgb.flags.writeable = False
-        
-        results = hands.process(image_rgb)
-        image_rgb.flags.writeable = True
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+    result_queue, stop_event, threads = start_hand_pipeline(cap, hands)
+
+    while True:
+        pipeline_output = result_queue.get()
+        if pipeline_output is None or isinstance(pipeline_output, Exception):
+            break
+
+        image, results = pipeline_output
 
         instruction_text = f"Hold hand at {known_distance_cm}cm. Press 'c' to capture."
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
                 mp_drawing.draw_landmarks(
-                    image_bgr, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+                    image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-                current_pixel_width, bbox = get_hand_bbox_and_width(image_bgr, hand_landmarks)
+                current_pixel_width, bbox = get_hand_bbox_and_width(image, hand_landmarks)
 
                 if bbox and current_pixel_width > 0:
                     captured_pixel_width = current_pixel_width
-                    cv2.rectangle(image_bgr, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
-                    cv2.putText(image_bgr, f"Current Px Width: {current_pixel_width:.0f}", 
+                    cv2.rectangle(image, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
+                    cv2.putText(image, f"Current Px Width: {current_pixel_width:.0f}", 
                                 (bbox[0], bbox[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
                     
                     instruction_text = f"Px Width: {current_pixel_width:.0f}. Hold at {known_distance_cm}cm. Press 'c'."
 
-        cv2.putText(image_bgr, instruction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
-        cv2.putText(image_bgr, "Press 'q' to quit.", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+        cv2.putText(image, instruction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+        cv2.putText(image, "Press 'q' to quit.", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
         
-        cv2.imshow('Camera Calibration - Press "c" to Capture', image_bgr)
+        cv2.imshow('Camera Calibration - Press "c" to Capture', image)
 
-        key = cv2.waitKey(5) & 0xFF
+        key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
         elif key == ord('c'):
@@ -140,7 +400,7 @@ def calibrate_camera() -> tuple:
                 print("\nIMPORTANT: Save this 'Focal Length' value and the 'Real Hand Width' you used.")
                 print("You will need them for the distance measurement program.")
                 
-                final_msg_img = image_bgr.copy()
+                final_msg_img = image.copy()
                 cv2.putText(final_msg_img, f"Focal Length (F): {focal_length_calculated:.2f}", 
                             (final_msg_img.shape[1]//2 - 200, final_msg_img.shape[0]//2), 
                             cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,0,255), 2, cv2.LINE_AA)
@@ -159,9 +419,14 @@ def calibrate_camera() -> tuple:
                 if not (known_distance_cm > 0) : print("  - Known distance is not a positive number.")
                 print("  Please ensure your hand is steadily in view and all input values are correct. Try again or press 'q' to quit.")
 
+    stop_hand_pipeline(stop_event, threads)
     cap.release()
     cv2.destroyAllWindows()
     hands.close()
+
+    if isinstance(pipeline_output, Exception):
+        raise pipeline_output
+
     return focal_length_calculated, real_hand_width_cm
 
 def calculate_hand_distance() -> None:
@@ -199,7 +464,7 @@ def calculate_hand_distance() -> None:
     print("Move your hand in front of the camera. The estimated distance will be displayed.")
     print("Press 'q' to quit.")
 
-    cap = cv2.VideoCapture(0)
+    cap = open_camera()
     if not cap.isOpened():
         print("Error: Cannot open camera.")
         return
@@ -207,60 +472,55 @@ def calculate_hand_distance() -> None:
     mp_hands = mp.solutions.hands
     hands = mp_hands.Hands(static_image_mode=False,
                            max_num_hands=1,
+                           model_complexity=0,
                            min_detection_confidence=0.7,
                            min_tracking_confidence=0.7)
-    mp_drawing = mp.solutions.drawing_utils
 
-    while cap.isOpened():
-        success, image = cap.read()
-        if not success:
-            print("Ignoring empty camera frame.")
-            continue
+    result_queue, stop_event, threads = start_hand_pipeline(cap, hands)
 
-        image = cv2.flip(image, 1)
+    while True:
+        pipeline_output = result_queue.get()
+        if pipeline_output is None or isinstance(pipeline_output, Exception):
+            break
 
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image_rgb.flags.writeable = False
-        
-        results = hands.process(image_rgb)
-        
-        image_rgb.flags.writeable = True
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+        image, results = pipeline_output
 
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    image_bgr, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                current_pixel_width, bbox = get_hand_bbox_and_width(image_bgr, hand_landmarks)
+                # Only the bbox matters for the distance, so the landmark skeleton is not drawn here.
+                current_pixel_width, bbox = get_hand_bbox_and_width(image, hand_landmarks)
 
                 if bbox and current_pixel_width > 0:
-                    cv2.rectangle(image_bgr, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
+                    cv2.rectangle(image, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
                     
                     estimated_distance_cm = (real_hand_width_cm_for_measurement * focal_length_from_calibration) / current_pixel_width
                     estimated_distance_m = estimated_distance_cm * (1/100)
 
                     if estimated_distance_m < 2:
-                        cv2.putText(image_bgr, f"Move Back!! {estimated_distance_m:.2f} m", 
+                        cv2.putText(image, f"Move Back!! {estimated_distance_m:.2f} m", 
                                     (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
 
-                    cv2.putText(image_bgr, f"Dist: {estimated_distance_cm:.1f} cm", 
+                    cv2.putText(image, f"Dist: {estimated_distance_cm:.1f} cm", 
                                 (bbox[0], bbox[1] - 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-                    cv2.putText(image_bgr, f"Dist: {estimated_distance_m:.2f} m",
+                    cv2.putText(image, f"Dist: {estimated_distance_m:.2f} m",
                                 (bbox[0], bbox[1] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-                    cv2.putText(image_bgr, f"Px Width: {current_pixel_width:.0f}", 
+                    cv2.putText(image, f"Px Width: {current_pixel_width:.0f}", 
                                 (bbox[0], bbox[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
 
-        # cv2.putText(image_bgr, "Press 'q' to quit.", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
-        cv2.imshow('Hand Distance Measurement', image_bgr)
+        # cv2.putText(image, "Press 'q' to quit.", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
+        cv2.imshow('Hand Distance Measurement', image)
 
-        if cv2.waitKey(5) & 0xFF == ord('q'):
+        if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
+    stop_hand_pipeline(stop_event, threads)
     cap.release()
     cv2.destroyAllWindows()
     hands.close()
 
+    if isinstance(pipeline_output, Exception):
+        raise pipeline_output
+
 if __name__ == '__main__':
     while True:
         print("\nHand Distance Measurement Utility")
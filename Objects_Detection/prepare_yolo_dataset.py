@@ -1,26 +1,57 @@
 import os
 import shutil
 import random
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 SOURCE_DATA_BASE_PATH = "dataset_2d_shapes"
 YOLO_DATASET_BASE_PATH = "yolo_shapes_dataset"
 TRAIN_SPLIT_RATIO = 0.8
+COPY_WORKERS = (os.cpu_count() or 1) * 2 # Copies are I/O bound, so oversubscribe the CPUs
 
 SHAPE_NAMES = ["Rectangle", "Square", "Circle", "Triangle"]
+
+def link_or_copy(source_path: str, dest_path: str) -> None:
+    """
+    Hardlinks a single dataset file into the YOLO layout, run from the copy worker threads.
+    Falls back to a real copy when linking is not possible (e.g. across filesystems).
+    YOLO only reads these files, so sharing the data with the source dataset is safe.
+    
+    Args:
+        source_path (str): The file to link or copy.
+        dest_path (str): Where to place it.
+    """
+    
+    # Replace output from a previous run, it may already be a link to the source.
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        # copyfile skips the permission copy and uses os.sendfile (Linux) or
+        # fcopyfile (macOS), so the data never passes through userspace.
+        shutil.copyfile(source_path, dest_path)
+
 for split in ["train", "val"]:
     os.makedirs(os.path.join(YOLO_DATASET_BASE_PATH, "images", split), exist_ok=True)
     os.makedirs(os.path.join(YOLO_DATASET_BASE_PATH, "labels", split), exist_ok=True)
 
 print(f"Created directory structure under: {YOLO_DATASET_BASE_PATH}")
 
+# Every shape is split on its own (stratified), but all copies go through one pool at the end.
+source_paths = []
+dest_paths = []
+
 for shape_name in SHAPE_NAMES:
     print(f"\nProcessing shape: {shape_name}")
 
-    source_image_dir = Path(SOURCE_DATA_BASE_PATH) / "images" / shape_name
-    source_label_dir = Path(SOURCE_DATA_BASE_PATH) / "labels" / shape_name
+    source_image_dir = os.path.join(SOURCE_DATA_BASE_PATH, "images", shape_name)
+    source_label_dir = os.path.join(SOURCE_DATA_BASE_PATH, "labels", shape_name)
 
-    image_files = sorted([f for f in source_image_dir.glob("*.png")])
+    image_files = []
+    if os.path.isdir(source_image_dir):
+        with os.scandir(source_image_dir) as entries:
+            image_files = sorted(entry.path for entry in entries if entry.name.endswith(".png") and entry.is_file())
     
     if not image_files:
         print(f"  No image files found for {shape_name} in {source_image_dir}")
@@ -36,29 +67,41 @@ for shape_name in SHAPE_NAMES:
     print(f"  Training images: {len(train_files)}")
     print(f"  Validation images: {len(val_files)}")
 
-    def copy_files(file_list, split_type):
+    def queue_files(file_list, split_type):
+        dest_img_dir = os.path.join(YOLO_DATASET_BASE_PATH, "images", split_type)
+        dest_label_dir = os.path.join(YOLO_DATASET_BASE_PATH, "labels", split_type)
+
         for img_file_path in file_list:
-            label_file_name = img_file_path.stem + ".txt"
-            label_file_path = source_label_dir / label_file_name
+            img_file_name = os.path.basename(img_file_path)
+            label_file_name = os.path.splitext(img_file_name)[0] + ".txt"
+            label_file_path = os.path.join(source_label_dir, label_file_name)
 
-            dest_img_path = Path(YOLO_DATASET_BASE_PATH) / "images" / split_type / img_file_path.name
-            dest_label_path = Path(YOLO_DATASET_BASE_PATH) / "labels" / split_type / label_file_name
+            dest_img_path = os.path.join(dest_img_dir, img_file_name)
+            dest_label_path = os.path.join(dest_label_dir, label_file_name)
             
-            if img_file_path.exists():
-                shutil.copy(img_file_path, dest_img_path)
+            if os.path.exists(img_file_path):
+                source_paths.append(img_file_path)
+                dest_paths.append(dest_img_path)
             else:
                 print(f"    Warning: Image file not found: {img_file_path}")
 
-            if label_file_path.exists():
-                shutil.copy(label_file_path, dest_label_path)
+            if os.path.exists(label_file_path):
+                source_paths.append(label_file_path)
+                dest_paths.append(dest_label_path)
             else:
-                print(f"    Warning: Label file not found for {img_file_path.name} at {label_file_path}")
+                print(f"    Warning: Label file not found for {img_file_name} at {label_file_path}")
 
-    print(f"  Copying training files for {shape_name}...")
-    copy_files(train_files, "train")
+    print(f"  Queueing training files for {shape_name}...")
+    queue_files(train_files, "train")
     
-    print(f"  Copying validation files for {shape_name}...")
-    copy_files(val_files, "val")
+    print(f"  Queueing validation files for {shape_name}...")
+    queue_files(val_files, "val")
+
+print(f"\nCopying {len(source_paths)} files with {COPY_WORKERS} workers...")
+
+# Consume the results so any copy error is raised here.
+with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+    list(executor.map(link_or_copy, source_paths, dest_paths))
 
 print("\nDataset preparation complete!")
 print(f"YOLOv8 compatible dataset is ready in: {YOLO_DATASET_BASE_PATH}")
\ No newline at end of file